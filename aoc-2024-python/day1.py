@@ -1,7 +1,16 @@
+from array import array
+from itertools import groupby
+from math import isqrt
 from pathlib import Path
-from typing import Sequence, Tuple
+from typing import Iterable, Iterator, List, Sequence, Tuple
+import heapq
+import tempfile
+import numpy as np
 
 class Day1:
+    # Widest value span for which histograms beat comparison sorting
+    MAX_COUNTING_RANGE = 1 << 20
+    
     @staticmethod
     def calculate_total_distance(left: Sequence[int], right: Sequence[int]) -> int:
         sorted_left = sorted(left)
@@ -40,21 +49,336 @@ class Day1:
         left, right = Day1.parse_input(input_str)
         return Day1.calculate_similarity_score(left, right)
     
+    @staticmethod
+    def parse_input_numpy(input_str: str) -> Tuple[np.ndarray, np.ndarray]:
+        # Every line holds exactly one left/right pair, so the flat token stream alternates columns
+        pairs = np.array(input_str.split(), dtype=np.int64).reshape(-1, 2)
+        return pairs[:, 0], pairs[:, 1]
+    
+    @staticmethod
+    def calculate_total_distance_numpy(left: np.ndarray, right: np.ndarray) -> int:
+        return int(np.abs(np.sort(left) - np.sort(right)).sum())
+    
+    @staticmethod
+    def calculate_similarity_score_numpy(left: np.ndarray, right: np.ndarray) -> int:
+        # Count occurrences in right list
+        values, counts = np.unique(right, return_counts=True)
+        if len(values) == 0:
+            return 0
+        
+        # Look up each left number among the distinct right values
+        idx = np.searchsorted(values, left)
+        idx[idx == len(values)] = 0
+        found = values[idx] == left
+        return int((left[found] * counts[idx[found]]).sum())
+    
+    @staticmethod
+    def calculate_total_distance_counting(left: np.ndarray, right: np.ndarray, lo: int, hi: int) -> int:
+        hist_left = np.bincount(left - lo, minlength=hi - lo + 1)
+        hist_right = np.bincount(right - lo, minlength=hi - lo + 1)
+        
+        # Pairing the k-th smallest values means every unit step between lo and hi
+        # is crossed by as many pairs as the two cumulative counts differ there
+        return int(np.abs(np.cumsum(hist_left) - np.cumsum(hist_right)).sum())
+    
+    @staticmethod
+    def solve_part1_bounded(input_str: str) -> int:
+        left, right = Day1.parse_input_numpy(input_str)
+        if len(left) == 0:
+            return 0
+        
+        lo = int(min(left.min(), right.min()))
+        hi = int(max(left.max(), right.max()))
+        if hi - lo < Day1.MAX_COUNTING_RANGE:
+            return Day1.calculate_total_distance_counting(left, right, lo, hi)
+        
+        # Unbounded IDs fall back to comparison sorting
+        return Day1.calculate_total_distance_numpy(left, right)
+    
+    @staticmethod
+    def solve_part1_numpy(input_str: str) -> int:
+        left, right = Day1.parse_input_numpy(input_str)
+        return Day1.calculate_total_distance_numpy(left, right)
+    
+    @staticmethod
+    def solve_part2_numpy(input_str: str) -> int:
+        left, right = Day1.parse_input_numpy(input_str)
+        return Day1.calculate_similarity_score_numpy(left, right)
+    
+    @staticmethod
+    def _write_sorted_run(values: List[int], path: Path) -> Path:
+        values.sort()
+        with open(path, 'wb') as f:
+            array('q', values).tofile(f)
+        return path
+    
+    @staticmethod
+    def _read_run(path: Path, block_size: int) -> Iterator[int]:
+        with open(path, 'rb') as f:
+            while True:
+                block = array('q')
+                try:
+                    block.fromfile(f, block_size)
+                except EOFError:  # Short final block, fromfile keeps what it read
+                    yield from block
+                    return
+                yield from block
+    
+    @staticmethod
+    def _merge_runs(paths: Sequence[Path], block_size: int) -> Iterator[int]:
+        return heapq.merge(*(Day1._read_run(path, block_size) for path in paths))
+    
+    @staticmethod
+    def _write_merged_run(paths: Sequence[Path], path: Path, block_size: int) -> Path:
+        with open(path, 'wb') as f:
+            block = array('q')
+            for value in Day1._merge_runs(paths, block_size):
+                block.append(value)
+                if len(block) >= block_size:
+                    block.tofile(f)
+                    block = array('q')
+            block.tofile(f)
+        return path
+    
+    @staticmethod
+    def _reduce_runs(paths: Sequence[Path], fan_in: int, block_size: int) -> List[Path]:
+        # Merge groups of at most fan_in runs into longer runs until fan_in runs remain,
+        # so no pass has more than fan_in + 1 files open
+        paths = list(paths)
+        merge_pass = 0
+        while len(paths) > fan_in:
+            merged = []
+            for i in range(0, len(paths), fan_in):
+                group = paths[i:i + fan_in]
+                if len(group) == 1:
+                    merged.append(group[0])
+                    continue
+                out = group[0].with_name(f'{group[0].stem}-pass{merge_pass}-{i}.bin')
+                merged.append(Day1._write_merged_run(group, out, block_size))
+                for path in group:
+                    path.unlink()
+            paths = merged
+            merge_pass += 1
+        return paths
+    
+    @staticmethod
+    def _count_groups(values: Iterable[int]) -> Iterator[Tuple[int, int]]:
+        for value, group in groupby(values):
+            yield value, sum(1 for _ in group)
+    
+    @staticmethod
+    def _merge_join_similarity(left: Iterable[int], right: Iterable[int]) -> int:
+        # Both streams are sorted, so equal values line up as we walk them together
+        left_groups = Day1._count_groups(left)
+        right_groups = Day1._count_groups(right)
+        left_value, left_count = next(left_groups, (None, 0))
+        right_value, right_count = next(right_groups, (None, 0))
+        score = 0
+        
+        while left_value is not None and right_value is not None:
+            if left_value < right_value:
+                left_value, left_count = next(left_groups, (None, 0))
+            elif left_value > right_value:
+                right_value, right_count = next(right_groups, (None, 0))
+            else:
+                score += left_value * left_count * right_count
+                left_value, left_count = next(left_groups, (None, 0))
+                right_value, right_count = next(right_groups, (None, 0))
+        
+        return score
+    
+    @staticmethod
+    def solve_streaming(filepath: str | Path, chunk_size: int = 1_000_000,
+                        block_size: int = 65_536, fan_in: int = 16) -> Tuple[int, int]:
+        """
+        Solve both parts without holding the input in memory.
+        Pairs are read chunk_size at a time and spilled to disk as sorted runs.
+        Each column's runs are merged down to at most fan_in runs, which are then
+        k-way merged for the distance and merge-joined for the similarity, so at most
+        2 * fan_in files and blocks of block_size values are open at once.
+        """
+        with tempfile.TemporaryDirectory(prefix='day1-') as tmp:
+            tmp_dir = Path(tmp)
+            left_runs: list[Path] = []
+            right_runs: list[Path] = []
+            
+            def flush(left: List[int], right: List[int]) -> None:
+                run_id = len(left_runs)
+                left_runs.append(Day1._write_sorted_run(left, tmp_dir / f'left-{run_id}.bin'))
+                right_runs.append(Day1._write_sorted_run(right, tmp_dir / f'right-{run_id}.bin'))
+            
+            left: List[int] = []
+            right: List[int] = []
+            with open(filepath) as f:
+                for line in f:
+                    numbers = line.split()
+                    if not numbers:  # Skip empty lines
+                        continue
+                    left.append(int(numbers[0]))
+                    right.append(int(numbers[1]))
+                    if len(left) >= chunk_size:
+                        flush(left, right)
+                        left, right = [], []
+            if left:
+                flush(left, right)
+            left_runs = Day1._reduce_runs(left_runs, fan_in, block_size)
+            right_runs = Day1._reduce_runs(right_runs, fan_in, block_size)
+            
+            total_distance = sum(abs(l - r) for l, r in zip(
+                Day1._merge_runs(left_runs, block_size),
+                Day1._merge_runs(right_runs, block_size)))
+            similarity_score = Day1._merge_join_similarity(
+                Day1._merge_runs(left_runs, block_size),
+                Day1._merge_runs(right_runs, block_size))
+        
+        return total_distance, similarity_score
+    
     @staticmethod
     def read_file(filepath: str | Path) -> str:
         return Path(filepath).read_text()
 
-def main(filepath: str) -> None:
-    input_str = Day1.read_file(filepath)
-    part1_result = Day1.solve_part1(input_str)
-    part2_result = Day1.solve_part2(input_str)
+class Day1Index:
+    """
+    Keeps the Day1 answers up to date while pairs are added and removed.
+    Pairing the k-th smallest values means the distance equals the sum over every
+    value t of |#left <= t - #right <= t|, so adding a pair (l, r) just shifts that
+    difference by one on the values between l and r. The differences over
+    0..max_value are split into sqrt(max_value) blocks that track how many of their
+    cells are negative, which makes each update O(sqrt(max_value)). Count maps keep
+    the similarity score exact in O(1).
+    """
+    def __init__(self, pairs: Iterable[Tuple[int, int]] = (), max_value: int = 100_000):
+        self.max_value = max_value
+        self.block_size = max(1, isqrt(max_value))
+        self.left_counts: dict[int, int] = {}
+        self.right_counts: dict[int, int] = {}
+        self.size = 0
+        for left, right in pairs:
+            self._check_range(left, right)
+            self.left_counts[left] = self.left_counts.get(left, 0) + 1
+            self.right_counts[right] = self.right_counts.get(right, 0) + 1
+            self.size += 1
+        
+        # Raw differences per value, with a pending shift per block
+        num_blocks = -(-max_value // self.block_size)
+        self.diff = array('i', [0]) * max_value
+        self.lazy = [0] * num_blocks
+        self.block_counts: list[dict[int, int]] = [{} for _ in range(num_blocks)]
+        self.negative = [0] * num_blocks
+        self.total_distance = 0
+        running = 0
+        for t in range(max_value):
+            running += self.left_counts.get(t, 0) - self.right_counts.get(t, 0)
+            block = t // self.block_size
+            self.diff[t] = running
+            self.block_counts[block][running] = self.block_counts[block].get(running, 0) + 1
+            self.negative[block] += running < 0
+            self.total_distance += abs(running)
+        
+        self.similarity_score = sum(num * count * self.right_counts.get(num, 0)
+                                    for num, count in self.left_counts.items())
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def _check_range(self, left: int, right: int) -> None:
+        if not (0 <= left < self.max_value and 0 <= right < self.max_value):
+            raise ValueError(f"Pair ({left}, {right}) is outside 0..{self.max_value - 1}")
+    
+    def _shift_cell(self, block: int, t: int, delta: int) -> None:
+        lazy = self.lazy[block]
+        counts = self.block_counts[block]
+        old = self.diff[t]
+        new = old + delta
+        Day1Index._decrement(counts, old)
+        counts[new] = counts.get(new, 0) + 1
+        self.diff[t] = new
+        self.total_distance += abs(new + lazy) - abs(old + lazy)
+        self.negative[block] += (new + lazy < 0) - (old + lazy < 0)
+    
+    def _shift_block(self, block: int, size: int, delta: int) -> None:
+        lazy = self.lazy[block]
+        counts = self.block_counts[block]
+        negative = self.negative[block]
+        if delta > 0:
+            # Non-negative cells grow, negative ones shrink and -1 becomes 0
+            self.total_distance += size - 2 * negative
+            self.negative[block] = negative - counts.get(-1 - lazy, 0)
+        else:
+            # Positive cells shrink, the rest grow and 0 becomes -1
+            zeros = counts.get(-lazy, 0)
+            self.total_distance += 2 * (negative + zeros) - size
+            self.negative[block] = negative + zeros
+        self.lazy[block] = lazy + delta
+    
+    def _range_add(self, lo: int, hi: int, delta: int) -> None:
+        # At most two partial blocks are updated cell by cell
+        while lo < hi:
+            block = lo // self.block_size
+            block_start = block * self.block_size
+            block_end = min(block_start + self.block_size, self.max_value)
+            if lo == block_start and hi >= block_end:
+                self._shift_block(block, block_end - block_start, delta)
+                lo = block_end
+            else:
+                stop = min(hi, block_end)
+                for t in range(lo, stop):
+                    self._shift_cell(block, t, delta)
+                lo = stop
+    
+    def add(self, left: int, right: int) -> None:
+        self._check_range(left, right)
+        if left < right:
+            self._range_add(left, right, 1)
+        elif right < left:
+            self._range_add(right, left, -1)
+        self.size += 1
+        
+        self.similarity_score += left * self.right_counts.get(left, 0)
+        self.left_counts[left] = self.left_counts.get(left, 0) + 1
+        self.similarity_score += right * self.left_counts.get(right, 0)
+        self.right_counts[right] = self.right_counts.get(right, 0) + 1
+    
+    def remove(self, left: int, right: int) -> None:
+        if left not in self.left_counts or right not in self.right_counts:
+            raise ValueError(f"Pair ({left}, {right}) is not in the index")
+        if left < right:
+            self._range_add(left, right, -1)
+        elif right < left:
+            self._range_add(right, left, 1)
+        self.size -= 1
+        
+        # Undo the similarity contributions in the reverse order of add
+        self.similarity_score -= right * self.left_counts.get(right, 0)
+        Day1Index._decrement(self.right_counts, right)
+        Day1Index._decrement(self.left_counts, left)
+        self.similarity_score -= left * self.right_counts.get(left, 0)
+    
+    @staticmethod
+    def _decrement(counts: dict[int, int], num: int) -> None:
+        if counts[num] == 1:
+            del counts[num]
+        else:
+            counts[num] -= 1
+
+def main(filepath: str, streaming: bool = False) -> None:
+    if streaming:
+        part1_result, part2_result = Day1.solve_streaming(filepath)
+    else:
+        input_str = Day1.read_file(filepath)
+        part1_result = Day1.solve_part1(input_str)
+        part2_result = Day1.solve_part2(input_str)
     
     print(f"Part 1 Result: {part1_result}")
     print(f"Part 2 Result: {part2_result}")
 
 if __name__ == "__main__":
     import sys
-    if len(sys.argv) != 2:
-        print("Usage: python day1.py <input_file>")
+    args = sys.argv[1:]
+    streaming = '--stream' in args
+    if streaming:
+        args.remove('--stream')
+    if len(args) != 1:
+        print("Usage: python day1.py [--stream] <input_file>")
         sys.exit(1)
-    main(sys.argv[1])
+    main(args[0], streaming)
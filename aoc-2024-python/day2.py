@@ -1,5 +1,6 @@
 from pathlib import Path
-from typing import Sequence, List
+from typing import Sequence, List, Tuple
+import numpy as np
 
 class Day2:
     @staticmethod
@@ -31,6 +32,62 @@ class Day2:
                 
         return False
 
+    @staticmethod
+    def _is_safe_step(a: int, b: int, sign: int) -> bool:
+        return 1 <= sign * (b - a) <= 3
+    
+    @staticmethod
+    def _is_safe_with_removal(levels: List[int], sign: int) -> bool:
+        n = len(levels)
+        step = Day2._is_safe_step
+        
+        # prefix[i]: levels[:i+1] is safe, suffix[i]: levels[i:] is safe
+        prefix = [True] * n
+        for i in range(1, n):
+            prefix[i] = prefix[i-1] and step(levels[i-1], levels[i], sign)
+        suffix = [True] * n
+        for i in range(n - 2, -1, -1):
+            suffix[i] = suffix[i+1] and step(levels[i], levels[i+1], sign)
+        
+        if suffix[1] or prefix[n-2]:  # Drop the first or last level
+            return True
+        
+        # Dropping an inner level must also bridge its two neighbours
+        return any(prefix[i-1] and suffix[i+1] and step(levels[i-1], levels[i+1], sign)
+                   for i in range(1, n - 1))
+    
+    @staticmethod
+    def is_safe_with_dampener_linear(levels: List[int]) -> bool:
+        # Any report of two levels or fewer is safe once one level is removed
+        if len(levels) <= 2:
+            return True
+        return Day2._is_safe_with_removal(levels, 1) or Day2._is_safe_with_removal(levels, -1)
+
+    @staticmethod
+    def _min_removals(levels: List[int], sign: int, k: int) -> int:
+        n = len(levels)
+        step = Day2._is_safe_step
+        
+        # removals[i]: fewest levels dropped before i in a safe run that keeps levels[i];
+        # the previous kept level can only be among the k+1 levels before it
+        removals = [0] * n
+        best = n
+        for i in range(n):
+            removals[i] = i
+            for j in range(max(0, i - k - 1), i):
+                if step(levels[j], levels[i], sign):
+                    removals[i] = min(removals[i], removals[j] + i - j - 1)
+            best = min(best, removals[i] + n - 1 - i)
+        return best
+    
+    @staticmethod
+    def is_safe_with_tolerance(levels: List[int], k: int) -> bool:
+        """Check if the report can be made safe by removing at most k levels."""
+        if len(levels) - k <= 1:
+            return True
+        return (Day2._min_removals(levels, 1, k) <= k or
+                Day2._min_removals(levels, -1, k) <= k)
+
     @staticmethod
     def parse_input(input_str: str) -> List[List[int]]:
         reports = []
@@ -40,6 +97,77 @@ class Day2:
                 reports.append(levels)
         return reports
     
+    @staticmethod
+    def parse_input_flat(input_str: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Pack all reports into one flat level array plus report offsets."""
+        lines = [line.split() for line in input_str.strip().split('\n')]
+        lengths = [len(tokens) for tokens in lines if tokens]  # Skip empty lines
+        values = np.array([x for tokens in lines for x in tokens], dtype=np.int64)
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        return values, offsets
+    
+    @staticmethod
+    def _segment_counts(flags: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        totals = np.zeros(len(flags) + 1, dtype=np.int64)
+        np.cumsum(flags, out=totals[1:])
+        return totals[ends] - totals[starts]
+    
+    @staticmethod
+    def is_safe_batch(values: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+        """Classify every report at once, returning a boolean mask per report."""
+        diffs = np.diff(values)
+        
+        # Report r owns the differences offsets[r] .. offsets[r+1]-2, the one after
+        # that straddles two reports and is never looked at
+        starts = offsets[:-1]
+        ends = np.maximum(offsets[1:] - 1, starts)
+        bad_increasing = Day2._segment_counts((diffs < 1) | (diffs > 3), starts, ends)
+        bad_decreasing = Day2._segment_counts((diffs > -1) | (diffs < -3), starts, ends)
+        return (bad_increasing == 0) | (bad_decreasing == 0)
+    
+    @staticmethod
+    def is_safe_with_dampener_batch(values: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+        """
+        Batch dampener check: every unsafe report is expanded into all of its
+        single-removal variants, which are classified with is_safe_batch in one go.
+        The expansion is quadratic in report length, so it suits many short reports.
+        """
+        safe = Day2.is_safe_batch(values, offsets)
+        unsafe = np.flatnonzero(~safe)
+        if len(unsafe) == 0:
+            return safe
+        
+        # One variant per (unsafe report, removed index)
+        starts = offsets[unsafe]
+        lengths = offsets[unsafe + 1] - starts
+        variant_report = np.repeat(np.arange(len(unsafe)), lengths)
+        first_variant = np.zeros(len(unsafe), dtype=np.int64)
+        np.cumsum(lengths[:-1], out=first_variant[1:])
+        removed = np.arange(len(variant_report)) - first_variant[variant_report]
+        
+        # Gather each variant's levels, skipping over the removed index
+        variant_lengths = lengths[variant_report] - 1
+        variant_offsets = np.zeros(len(variant_lengths) + 1, dtype=np.int64)
+        np.cumsum(variant_lengths, out=variant_offsets[1:])
+        local = np.arange(variant_offsets[-1]) - np.repeat(variant_offsets[:-1], variant_lengths)
+        local += local >= np.repeat(removed, variant_lengths)
+        variant_values = values[np.repeat(starts[variant_report], variant_lengths) + local]
+        
+        variant_safe = Day2.is_safe_batch(variant_values, variant_offsets)
+        safe[unsafe] = np.add.reduceat(variant_safe, first_variant) > 0
+        return safe
+    
+    @staticmethod
+    def solve_part1_batch(input_str: str) -> int:
+        values, offsets = Day2.parse_input_flat(input_str)
+        return int(Day2.is_safe_batch(values, offsets).sum())
+    
+    @staticmethod
+    def solve_part2_batch(input_str: str) -> int:
+        values, offsets = Day2.parse_input_flat(input_str)
+        return int(Day2.is_safe_with_dampener_batch(values, offsets).sum())
+    
     @staticmethod
     def solve_part1(input_str: str) -> int:
         reports = Day2.parse_input(input_str)
@@ -48,7 +176,7 @@ class Day2:
     @staticmethod
     def solve_part2(input_str: str) -> int:
         reports = Day2.parse_input(input_str)
-        return sum(1 for report in reports if Day2.is_safe_with_dampener(report))
+        return sum(1 for report in reports if Day2.is_safe_with_tolerance(report, 1))
     
     @staticmethod
     def read_file(filepath: str | Path) -> str:
@@ -90,6 +218,10 @@ def main(filepath: str) -> None:
     for levels, expected in test_cases:
         result = Day2.is_safe_with_dampener(levels)
         assert result == expected, f"Part 2 test case failed for {levels}: expected {expected}, got {result}"
+        result = Day2.is_safe_with_dampener_linear(levels)
+        assert result == expected, f"Part 2 linear test case failed for {levels}: expected {expected}, got {result}"
+        result = Day2.is_safe_with_tolerance(levels, 1)
+        assert result == expected, f"Part 2 tolerance test case failed for {levels}: expected {expected}, got {result}"
 
 if __name__ == "__main__":
     import sys
@@ -1,8 +1,15 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from typing import List, Tuple
+from typing import Iterable, List, Optional, Tuple
+import mmap
 import re
 
 class Day3:
+    TOKEN_PATTERN = re.compile(rb"mul\((\d{1,3}),(\d{1,3})\)|do\(\)|don't\(\)")
+    # Longest token is mul(999,999)
+    MAX_TOKEN_LENGTH = 12
+    
     @staticmethod
     def parse_multiplications(input_str: str) -> List[Tuple[int, int]]:
         pattern = r'mul\((\d{1,3}),(\d{1,3})\)'
@@ -11,35 +18,21 @@ class Day3:
     
     @staticmethod
     def parse_with_conditions(input_str: str) -> List[Tuple[int, int]]:
-        # Find all mul instructions and control instructions with their positions
-        mul_pattern = r'mul\((\d{1,3}),(\d{1,3})\)'
-        do_pattern = r'do\(\)'
-        dont_pattern = r"don't\(\)"
-        
-        # Get all multiplications with their positions
-        muls = [(m.start(), int(m.group(1)), int(m.group(2))) 
-                for m in re.finditer(mul_pattern, input_str)]
-        
-        # Get all control instructions with their positions
-        dos = [m.start() for m in re.finditer(do_pattern, input_str)]
-        donts = [m.start() for m in re.finditer(dont_pattern, input_str)]
-        
-        # Combine and sort control instructions by position
-        controls = [(pos, True) for pos in dos] + [(pos, False) for pos in donts]
-        controls.sort()
+        # One alternation yields mul/do/don't tokens in text order
+        pattern = r"mul\((\d{1,3}),(\d{1,3})\)|do\(\)|don't\(\)"
         
         # Initialize with enabled state
         enabled = True
         result = []
         
-        # Process each multiplication based on the most recent control instruction
-        for mul_pos, x, y in muls:
-            # Update enabled state based on any control instructions before this mul
-            while controls and controls[0][0] < mul_pos:
-                _, enabled = controls.pop(0)
-            
-            if enabled:
-                result.append((x, y))
+        for m in re.finditer(pattern, input_str):
+            token = m.group(0)
+            if token == 'do()':
+                enabled = True
+            elif token == "don't()":
+                enabled = False
+            elif enabled:
+                result.append((int(m.group(1)), int(m.group(2))))
                 
         return result
     
@@ -57,14 +50,95 @@ class Day3:
         multiplications = Day3.parse_with_conditions(input_str)
         return Day3.calculate_sum(multiplications)
     
+    @staticmethod
+    def _scan_window(data: bytes | mmap.mmap, start: int,
+                     end: int) -> Tuple[int, int, int, Optional[bool]]:
+        """
+        Sum the tokens that start in data[start:end], reading up to MAX_TOKEN_LENGTH
+        bytes past end so a token straddling the boundary is counted here and only here.
+        Returns (sum of all products, enabled sum if the window starts enabled,
+        enabled sum if it starts disabled, final state or None if no do/don't was seen).
+        """
+        total = 0
+        leading = 0  # Products before the first do/don't, enabled only if the window starts enabled
+        enabled_total = 0
+        state = None
+        stop = min(end + Day3.MAX_TOKEN_LENGTH, len(data))
+        
+        for m in Day3.TOKEN_PATTERN.finditer(data, start, stop):
+            if m.start() >= end:
+                break
+            token = m.group(0)
+            if token == b'do()':
+                state = True
+            elif token == b"don't()":
+                state = False
+            else:
+                product = int(m.group(1)) * int(m.group(2))
+                total += product
+                if state is None:
+                    leading += product
+                elif state:
+                    enabled_total += product
+        
+        return total, leading + enabled_total, enabled_total, state
+    
+    @staticmethod
+    def _scan_file_window(filepath: str, start: int, end: int) -> Tuple[int, int, int, Optional[bool]]:
+        with open(filepath, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return Day3._scan_window(data, start, end)
+    
+    @staticmethod
+    def _combine_windows(summaries: Iterable[Tuple[int, int, int, Optional[bool]]]) -> Tuple[int, int]:
+        # Windows compose left to right: each one picks its sum by the incoming state
+        part1 = 0
+        part2 = 0
+        enabled = True
+        for total, if_enabled, if_disabled, state in summaries:
+            part1 += total
+            part2 += if_enabled if enabled else if_disabled
+            if state is not None:
+                enabled = state
+        return part1, part2
+    
+    @staticmethod
+    def solve_mmap(filepath: str | Path, window_size: int = 1 << 24) -> Tuple[int, int]:
+        """Solve both parts over a memory-mapped file, one window at a time."""
+        if Path(filepath).stat().st_size == 0:
+            return 0, 0
+        with open(filepath, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return Day3._combine_windows(
+                    Day3._scan_window(data, start, start + window_size)
+                    for start in range(0, len(data), window_size))
+    
+    @staticmethod
+    def solve_parallel(filepath: str | Path, window_size: int = 1 << 24,
+                       workers: Optional[int] = None) -> Tuple[int, int]:
+        """Solve both parts with windows scanned independently in a process pool."""
+        size = Path(filepath).stat().st_size
+        if size == 0:
+            return 0, 0
+        starts = range(0, size, window_size)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            summaries = executor.map(Day3._scan_file_window, repeat(str(filepath)), starts,
+                                     [start + window_size for start in starts])
+            return Day3._combine_windows(summaries)
+    
     @staticmethod
     def read_file(filepath: str | Path) -> str:
         return Path(filepath).read_text()
 
-def main(filepath: str) -> None:
-    input_str = Day3.read_file(filepath)
-    part1_result = Day3.solve_part1(input_str)
-    part2_result = Day3.solve_part2(input_str)
+def main(filepath: str, use_mmap: bool = False, parallel: bool = False) -> None:
+    if parallel:
+        part1_result, part2_result = Day3.solve_parallel(filepath)
+    elif use_mmap:
+        part1_result, part2_result = Day3.solve_mmap(filepath)
+    else:
+        input_str = Day3.read_file(filepath)
+        part1_result = Day3.solve_part1(input_str)
+        part2_result = Day3.solve_part2(input_str)
     
     print(f"Part 1 Result: {part1_result}")
     print(f"Part 2 Result: {part2_result}")
@@ -86,7 +160,14 @@ def main(filepath: str) -> None:
 
 if __name__ == "__main__":
     import sys
-    if len(sys.argv) != 2:
-        print("Usage: python day3.py <input_file>")
+    args = sys.argv[1:]
+    use_mmap = '--mmap' in args
+    if use_mmap:
+        args.remove('--mmap')
+    parallel = '--parallel' in args
+    if parallel:
+        args.remove('--parallel')
+    if len(args) != 1:
+        print("Usage: python day3.py [--mmap | --parallel] <input_file>")
         sys.exit(1)
-    main(sys.argv[1])
+    main(args[0], use_mmap, parallel)
@@ -1,5 +1,7 @@
 import sys
-from typing import List, Tuple
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Tuple
+import numpy as np
 
 def find_xmas(grid: List[str]) -> int:
     rows = len(grid)
@@ -36,6 +38,136 @@ def find_xmas(grid: List[str]) -> int:
     
     return count
 
+def find_word_numpy(grid: List[str], word: str = 'XMAS') -> int:
+    """Count word in all 8 directions by AND-ing shifted slices of the grid."""
+    letters = np.frombuffer(''.join(grid).encode(), dtype=np.uint8).reshape(len(grid), -1)
+    rows, cols = letters.shape
+    n = len(word)
+    codes = word.encode()
+    count = 0
+    
+    for dx, dy in [(0, 1), (1, 0), (1, 1), (1, -1), (0, -1), (-1, 0), (-1, 1), (-1, -1)]:
+        # Start cells whose whole word stays inside the grid
+        row_lo, row_hi = max(0, -dx * (n - 1)), rows - max(0, dx * (n - 1))
+        col_lo, col_hi = max(0, -dy * (n - 1)), cols - max(0, dy * (n - 1))
+        if row_lo >= row_hi or col_lo >= col_hi:
+            continue
+        
+        mask = np.ones((row_hi - row_lo, col_hi - col_lo), dtype=bool)
+        for i, code in enumerate(codes):
+            shifted = letters[row_lo + dx * i:row_hi + dx * i, col_lo + dy * i:col_hi + dy * i]
+            mask &= shifted == code
+        count += int(mask.sum())
+    
+    return count
+
+class AhoCorasick:
+    """Automaton that finds every occurrence of a set of words in one pass over a text."""
+    def __init__(self, words: List[str]):
+        self.words = words
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[int]] = [[]]
+        
+        # Build the trie
+        for index, word in enumerate(words):
+            state = 0
+            for char in word:
+                if char not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[state][char] = len(self.goto) - 1
+                state = self.goto[state][char]
+            self.output[state].append(index)
+        
+        # Breadth-first fill of failure links, inheriting the outputs of each suffix state
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                # Children of the root always fall back to the root
+                self.fail[child] = self.goto[fallback].get(char, 0) if state else 0
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+    
+    def count_into(self, text: str, counts: List[int]) -> None:
+        goto, fail, output = self.goto, self.fail, self.output
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for index in output[state]:
+                counts[index] += 1
+
+def grid_lines(grid: List[str]) -> Iterator[str]:
+    """Yield every row, column, diagonal and anti-diagonal of the grid once."""
+    rows = len(grid)
+    cols = len(grid[0])
+    yield from grid
+    for col in range(cols):
+        yield ''.join(grid[row][col] for row in range(rows))
+    for d in range(-(rows - 1), cols):  # down-right, col - row == d
+        yield ''.join(grid[row][row + d] for row in range(max(0, -d), min(rows, cols - d)))
+    for s in range(rows + cols - 1):  # down-left, row + col == s
+        yield ''.join(grid[row][s - row] for row in range(max(0, s - cols + 1), min(rows, s + 1)))
+
+def find_words(grid: List[str], words: List[str]) -> Dict[str, int]:
+    """Count each word in all 8 directions with a single Aho-Corasick automaton."""
+    unique_words = list(dict.fromkeys(words))
+    automaton = AhoCorasick(unique_words)
+    counts = [0] * len(unique_words)
+    
+    # Reading each line backwards covers the 4 opposite directions
+    for line in grid_lines(grid):
+        automaton.count_into(line, counts)
+        automaton.count_into(line[::-1], counts)
+    
+    return dict(zip(unique_words, counts))
+
+def _count_band_matches(cells: List[np.ndarray], codes: bytes, dy: int) -> int:
+    # Letter i is read from cells[i], dy * i columns right of the start column
+    width = len(cells[0])
+    span = dy * (len(codes) - 1)
+    lo, hi = max(0, -span), width - max(0, span)
+    if lo >= hi:
+        return 0
+    
+    mask = np.ones(hi - lo, dtype=bool)
+    for i, code in enumerate(codes):
+        mask &= cells[i][lo + dy * i:hi + dy * i] == code
+    return int(mask.sum())
+
+def count_word_streaming(lines: Iterable[str], word: str = 'XMAS') -> int:
+    """
+    Count word in all 8 directions while reading the grid one row at a time.
+    Only the last len(word) rows are kept, and each occurrence is counted when
+    the newest row is the lowest row it touches.
+    """
+    band: deque = deque(maxlen=len(word))
+    targets = [word.encode(), word[::-1].encode()]  # Reversed word covers the opposite direction
+    count = 0
+    
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        row = np.frombuffer(line.encode(), dtype=np.uint8)
+        band.append(row)
+        
+        for codes in targets:
+            count += _count_band_matches([row] * len(word), codes, 1)
+            if len(band) == len(word):
+                cells = list(band)
+                for dy in (0, 1, -1):  # down, down-right, down-left
+                    count += _count_band_matches(cells, codes, dy)
+    
+    return count
+
 def test_examples():
     # Example 1 - Simple grid with dots
     example1 = [
@@ -62,6 +194,10 @@ def test_examples():
     
     count1 = find_xmas(example1)
     count2 = find_xmas(example2)
+    assert find_word_numpy(example1) == count1
+    assert find_word_numpy(example2) == count2
+    assert find_words(example2, ['XMAS']) == {'XMAS': count2}
+    assert count_word_streaming(example2) == count2
     
     print("\nExample results:")
     print(f"Example 1: Found {count1} occurrences of XMAS")
@@ -69,21 +205,29 @@ def test_examples():
     
     return count2 == 18  # Verify against known answer
 
-def main(filename: str) -> None:
-    # Read input grid from file
-    with open(filename) as f:
-        grid = [line.strip() for line in f]
-    
-    # Find all XMAS occurrences
-    result = find_xmas(grid)
+def main(filename: str, streaming: bool = False) -> None:
+    if streaming:
+        with open(filename) as f:
+            result = count_word_streaming(f)
+    else:
+        # Read input grid from file
+        with open(filename) as f:
+            grid = [line.strip() for line in f]
+        
+        # Find all XMAS occurrences
+        result = find_word_numpy(grid)
     print(f"\nResult: Found {result} occurrences of XMAS in the puzzle input")
     
     # Run tests on examples
     test_examples()
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python script.py input_file")
+    args = sys.argv[1:]
+    streaming = '--stream' in args
+    if streaming:
+        args.remove('--stream')
+    if len(args) != 1:
+        print("Usage: python script.py [--stream] input_file")
         sys.exit(1)
     
-    main(sys.argv[1])
+    main(args[0], streaming)
@@ -1,3 +1,5 @@
+import numpy as np
+
 def find_xmas_patterns(grid):
     rows = len(grid)
     cols = len(grid[0])
@@ -16,7 +18,6 @@ def find_xmas_patterns(grid):
         word += grid[r1][c1]
         word += grid[sr][sc]
         word += grid[r2][c2]
-        print(word)
         return word in ['MAS', 'SAM']
 
     # Find each 'A' in the grid
@@ -32,13 +33,59 @@ def find_xmas_patterns(grid):
 
     return count
 
+X_MAS_TEMPLATE = [
+    "M.S",
+    ".A.",
+    "M.S"
+]
+
+def rotate_template(template):
+    """Rotate a template a quarter turn clockwise"""
+    return [''.join(row[col] for row in reversed(template)) for col in range(len(template[0]))]
+
+def template_variants(templates):
+    """All distinct rotations and reflections of the given templates"""
+    variants = []
+    for template in templates:
+        for current in (template, [row[::-1] for row in template]):
+            for _ in range(4):
+                if current not in variants:
+                    variants.append(current)
+                current = rotate_template(current)
+    return variants
+
+def count_templates(grid, templates, wildcard='.'):
+    """
+    Count placements of any rotation or reflection of the templates in the grid.
+    Wildcard cells in a template match anything; every other cell is compared
+    against a shifted view of the whole grid at once.
+    """
+    letters = np.frombuffer(''.join(grid).encode(), dtype=np.uint8).reshape(len(grid), -1)
+    rows, cols = letters.shape
+    count = 0
+
+    for variant in template_variants(templates):
+        height, width = len(variant), len(variant[0])
+        if height > rows or width > cols:
+            continue
+
+        # Anchor is the template's top-left corner
+        mask = np.ones((rows - height + 1, cols - width + 1), dtype=bool)
+        for dr, line in enumerate(variant):
+            for dc, char in enumerate(line):
+                if char != wildcard:
+                    mask &= letters[dr:dr + rows - height + 1, dc:dc + cols - width + 1] == ord(char)
+        count += int(mask.sum())
+
+    return count
+
 def main(filename):
     # Read input
     with open(filename) as f:
         grid = [line.strip() for line in f]
     
     # Find X-MAS patterns
-    result = find_xmas_patterns(grid)
+    result = count_templates(grid, [X_MAS_TEMPLATE])
     print(f"\nFound {result} X-MAS patterns in the input")
     
     # Test cases
@@ -78,7 +125,8 @@ def main(filename):
     
     print("\nTest results:")
     for i, example in enumerate(examples, 1):
-        result = find_xmas_patterns(example)
+        result = count_templates(example, [X_MAS_TEMPLATE])
+        assert result == find_xmas_patterns(example)
         print(f"Example {i}: {result}" + (" (should be 9)" if i == 4 else ""))
 
 if __name__ == "__main__":
@@ -1,5 +1,4 @@
 from collections import defaultdict
-import networkx as nx
 import sys
 
 def read_input(filename):
@@ -27,6 +26,8 @@ def parse_input(input_text):
     return rules, updates
 
 def is_valid_order(pages, rules):
+    import networkx as nx
+
     # Create a directed graph for the rules
     G = nx.DiGraph()
     
@@ -50,6 +51,50 @@ def is_valid_order(pages, rules):
             
     return True
 
+class BitsetRuleIndex:
+    """Ordering rules with pages mapped to dense indices and neighbour sets stored as bitmasks."""
+    def __init__(self, rules):
+        self.index = {}
+        for before, after in rules:
+            self.index.setdefault(before, len(self.index))
+            self.index.setdefault(after, len(self.index))
+        
+        self.successors = [0] * len(self.index)
+        self.predecessors = [0] * len(self.index)
+        for before, after in rules:
+            b, a = self.index[before], self.index[after]
+            self.successors[b] |= 1 << a
+            self.predecessors[a] |= 1 << b
+    
+    def is_valid_order(self, pages):
+        # Pages without rules can't break the order
+        seen = 0
+        for page in pages:
+            i = self.index.get(page)
+            if i is None:
+                continue
+            seen |= 1 << i
+            # A successor already placed (or the page itself) breaks the order
+            if self.successors[i] & seen:
+                return False
+        return True
+    
+    def is_acyclic(self, pages):
+        """Check the rules between these pages have no cycle by peeling off sources."""
+        remaining = [self.index[page] for page in set(pages) if page in self.index]
+        remaining_mask = 0
+        for i in remaining:
+            remaining_mask |= 1 << i
+        
+        while remaining:
+            sources = [i for i in remaining if not self.predecessors[i] & remaining_mask]
+            if not sources:
+                return False
+            for i in sources:
+                remaining_mask &= ~(1 << i)
+            remaining = [i for i in remaining if remaining_mask >> i & 1]
+        return True
+
 def get_middle_page(pages):
     return pages[len(pages) // 2]
 
@@ -58,15 +103,69 @@ def solve_puzzle(input_text):
     rules, updates = parse_input(input_text)
     
     # Find valid updates and their middle pages
+    rule_index = BitsetRuleIndex(rules)
     valid_middle_pages = []
     for update in updates:
-        if is_valid_order(update, rules):
+        if rule_index.is_valid_order(update):
             middle = get_middle_page(update)
             valid_middle_pages.append(middle)
             
     # Return sum of middle pages
     return sum(valid_middle_pages)
 
+def validate_updates_numpy(rules, updates, batch_size=4096):
+    """
+    Check every rule against every update at once.
+    Updates are encoded as a position matrix pos[update, page_index] (-1 when the
+    page is absent) in the smallest integer type that fits the longest update,
+    and processed batch_size updates at a time to bound memory.
+    Returns a validity mask and the middle page of each update as arrays.
+    """
+    import numpy as np
+
+    rule_array = np.array(rules, dtype=np.int64).reshape(-1, 2)
+    rule_pages, dense_rules = np.unique(rule_array, return_inverse=True)
+    dense_rules = dense_rules.reshape(-1, 2)
+    before, after = dense_rules[:, 0], dense_rules[:, 1]
+
+    lengths = np.array([len(pages) for pages in updates], dtype=np.int64)
+    flat_pages = np.array([page for pages in updates for page in pages], dtype=np.int64)
+    offsets = np.zeros(len(updates) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    middles = flat_pages[offsets[:-1] + lengths // 2]
+
+    # Dense index of each page, -1 for pages no rule mentions
+    dense_pages = np.full(len(flat_pages), -1, dtype=np.int64)
+    if len(rule_pages):
+        lookup = np.searchsorted(rule_pages, flat_pages)
+        lookup[lookup == len(rule_pages)] = 0
+        found = rule_pages[lookup] == flat_pages
+        dense_pages[found] = lookup[found]
+    rows = np.repeat(np.arange(len(updates)), lengths)
+    cols = np.arange(len(flat_pages)) - offsets[rows]
+
+    # Updates are short, so positions usually fit in int8
+    position_type = np.result_type(np.min_scalar_type(-1), np.min_scalar_type(int(lengths.max(initial=0))))
+    valid = np.ones(len(updates), dtype=bool)
+    for start in range(0, len(updates), batch_size):
+        stop = min(start + batch_size, len(updates))
+        in_batch = slice(offsets[start], offsets[stop])
+        known = dense_pages[in_batch] >= 0
+        pos = np.full((stop - start, len(rule_pages)), -1, dtype=position_type)
+        pos[rows[in_batch][known] - start, dense_pages[in_batch][known]] = cols[in_batch][known]
+
+        # A rule is broken when its after page is present and not strictly later
+        after_pos = pos[:, after]
+        broken = (after_pos >= 0) & (pos[:, before] >= after_pos)
+        valid[start:stop] = ~broken.any(axis=1)
+
+    return valid, middles
+
+def solve_puzzle_numpy(input_text):
+    rules, updates = parse_input(input_text)
+    valid, middles = validate_updates_numpy(rules, updates)
+    return int(middles[valid].sum())
+
 def main():
     if len(sys.argv) != 2:
         print("Please provide input file path as command line argument")
@@ -77,4 +176,44 @@ def main():
     print(f"Sum of middle pages from valid updates: {result}")
 
 if __name__ == "__main__":
+    # Test with example
+    example = """47|53
+97|13
+97|61
+97|47
+75|29
+61|13
+75|53
+29|13
+97|29
+53|29
+61|53
+97|53
+61|29
+47|13
+75|47
+97|75
+47|61
+75|61
+47|29
+75|13
+53|13
+
+75,47,61,53,29
+97,61,53,29,13
+75,29,13
+75,97,47,61,53
+61,13,29
+97,13,75,29,47"""
+
+    example_result = solve_puzzle(example)
+    print(f"Example result: {example_result}")
+    assert example_result == 143, f"Expected 143, got {example_result}"
+
+    # The example rules never contradict each other on an update, a 2-cycle does
+    rules, updates = parse_input(example)
+    rule_index = BitsetRuleIndex(rules)
+    assert all(rule_index.is_acyclic(update) for update in updates)
+    assert not BitsetRuleIndex(rules + [(13, 97)]).is_acyclic(updates[1])
+
     main()
@@ -1,5 +1,5 @@
 from collections import defaultdict
-import networkx as nx
+from functools import cmp_to_key
 import sys
 
 def read_input(filename):
@@ -27,6 +27,8 @@ def parse_input(input_text):
     return rules, updates
 
 def is_valid_order(pages, rules):
+    import networkx as nx
+
     # Create a directed graph for the rules
     G = nx.DiGraph()
     
@@ -51,6 +53,8 @@ def is_valid_order(pages, rules):
     return True
 
 def get_correct_order(pages, rules):
+    import networkx as nx
+
     # Create a directed graph for the rules
     G = nx.DiGraph()
     
@@ -71,14 +75,99 @@ def get_correct_order(pages, rules):
     except nx.NetworkXUnfeasible:
         return None  # In case of cycles
 
+class RuleIndex:
+    """Ordering rules parsed once into a pair set and per-page successor sets."""
+    def __init__(self, rules):
+        self.pairs = set()
+        self.successors = defaultdict(set)
+        self.predecessors = defaultdict(set)
+        for before, after in rules:
+            self.add_rule(before, after)
+    
+    def add_rule(self, before, after):
+        self.pairs.add((before, after))
+        self.successors[before].add(after)
+        self.predecessors[after].add(before)
+    
+    def remove_rule(self, before, after):
+        self.pairs.discard((before, after))
+        self.successors[before].discard(after)
+        self.predecessors[after].discard(before)
+    
+    def is_valid_order(self, pages):
+        seen = set()
+        for page in pages:
+            seen.add(page)
+            # Page must come before something already placed (or before itself)
+            successors = self.successors.get(page)
+            if successors and not successors.isdisjoint(seen):
+                return False
+        return True
+    
+    def compare(self, a, b):
+        if (a, b) in self.pairs:
+            return -1
+        if (b, a) in self.pairs:
+            return 1
+        return 0
+    
+    def get_correct_order(self, pages):
+        # Rules usually give a total order on an update, so a plain sort is enough
+        ordered = sorted(pages, key=cmp_to_key(self.compare))
+        if self.is_valid_order(ordered):
+            return ordered
+        return self.topological_order(pages)
+    
+    def topological_order(self, pages):
+        """Kahn's algorithm over the rules between these pages, None if they form a cycle"""
+        successors = [[] for _ in pages]
+        in_degree = [0] * len(pages)
+        for i, before in enumerate(pages):
+            for j, after in enumerate(pages):
+                if (before, after) in self.pairs:
+                    successors[i].append(j)
+                    in_degree[j] += 1
+        
+        ready = [i for i in range(len(pages)) if in_degree[i] == 0]
+        order = []
+        while ready:
+            i = ready.pop()
+            order.append(pages[i])
+            for j in successors[i]:
+                in_degree[j] -= 1
+                if in_degree[j] == 0:
+                    ready.append(j)
+        
+        return order if len(order) == len(pages) else None
+    
+    def select_middle_page(self, pages):
+        """Middle page of the corrected order, found without building the order"""
+        page_set = set(pages)
+        before_counts = {page: len(page_set.intersection(self.predecessors.get(page, ())))
+                         for page in pages}
+        
+        # Without contradicting pairs, counts that are a permutation of 0..len-1 cover
+        # all len*(len-1)/2 pairs one way each, so the rules totally order the update
+        # and the page at index i has exactly i predecessors
+        middle = len(pages) // 2
+        contradicting = any((after, page) in self.pairs
+                            for page in page_set
+                            for after in page_set.intersection(self.successors.get(page, ())))
+        if not contradicting and sorted(before_counts.values()) == list(range(len(pages))):
+            return next(page for page, count in before_counts.items() if count == middle)
+        
+        correct_order = self.get_correct_order(pages)
+        return get_middle_page(correct_order) if correct_order else None
+
 def get_middle_page(pages):
     return pages[len(pages) // 2]
 
 def solve_puzzle_part1(rules, updates):
     # Find valid updates and their middle pages
+    rule_index = RuleIndex(rules)
     valid_middle_pages = []
     for update in updates:
-        if is_valid_order(update, rules):
+        if rule_index.is_valid_order(update):
             middle = get_middle_page(update)
             valid_middle_pages.append(middle)
             
@@ -87,17 +176,86 @@ def solve_puzzle_part1(rules, updates):
 
 def solve_puzzle_part2(rules, updates):
     # Find invalid updates and reorder them
+    rule_index = RuleIndex(rules)
     reordered_middle_pages = []
     for update in updates:
-        if not is_valid_order(update, rules):
-            correct_order = get_correct_order(update, rules)
-            if correct_order:  # Make sure we found a valid order
-                middle = get_middle_page(correct_order)
+        if not rule_index.is_valid_order(update):
+            middle = rule_index.select_middle_page(update)
+            if middle is not None:  # Make sure we found a valid order
                 reordered_middle_pages.append(middle)
             
     # Return sum of middle pages from reordered updates
     return sum(reordered_middle_pages)
 
+class UpdateBook:
+    """
+    Keeps both part sums current while ordering rules are added and removed.
+    Inverted indexes from page pairs (and single pages, for self-loop rules) to the
+    updates containing them mean a rule change only re-checks the updates it can affect.
+    """
+    def __init__(self, rules, updates):
+        self.rule_index = RuleIndex(rules)
+        self.updates = updates
+        self.updates_by_pair = defaultdict(list)
+        self.updates_by_page = defaultdict(list)
+        for u, pages in enumerate(updates):
+            for page in set(pages):
+                self.updates_by_page[page].append(u)
+            for i, a in enumerate(pages):
+                for b in pages[i + 1:]:
+                    self.updates_by_pair[UpdateBook._pair_key(a, b)].append(u)
+        
+        # Each update adds its middle page to exactly one of the two sums
+        self.part1_sum = 0
+        self.part2_sum = 0
+        self.contributions = [(True, 0)] * len(updates)
+        for u in range(len(updates)):
+            self._refresh(u)
+    
+    @staticmethod
+    def _pair_key(a, b):
+        return (a, b) if a <= b else (b, a)
+    
+    def _refresh(self, u):
+        is_valid, middle = self.contributions[u]
+        if is_valid:
+            self.part1_sum -= middle
+        else:
+            self.part2_sum -= middle
+        
+        pages = self.updates[u]
+        if self.rule_index.is_valid_order(pages):
+            middle = get_middle_page(pages)
+            self.part1_sum += middle
+            self.contributions[u] = (True, middle)
+        else:
+            middle = self.rule_index.select_middle_page(pages) or 0
+            self.part2_sum += middle
+            self.contributions[u] = (False, middle)
+    
+    def _refresh_affected(self, rules):
+        affected = set()
+        for before, after in rules:
+            if before == after:
+                # A self-loop breaks every update containing the page
+                affected.update(self.updates_by_page.get(before, ()))
+            else:
+                affected.update(self.updates_by_pair.get(UpdateBook._pair_key(before, after), ()))
+        for u in affected:
+            self._refresh(u)
+    
+    def add_rules(self, rules):
+        rules = [rule for rule in rules if rule not in self.rule_index.pairs]
+        for before, after in rules:
+            self.rule_index.add_rule(before, after)
+        self._refresh_affected(rules)
+    
+    def remove_rules(self, rules):
+        rules = [rule for rule in rules if rule in self.rule_index.pairs]
+        for before, after in rules:
+            self.rule_index.remove_rule(before, after)
+        self._refresh_affected(rules)
+
 def main():
     if len(sys.argv) != 2:
         print("Please provide input file path as command line argument")
@@ -149,3 +307,22 @@ rules, updates = parse_input(example_input)
 part2_result = solve_puzzle_part2(rules, updates)
 print(f"\nTest result: {part2_result}")
 assert part2_result == 123, f"Expected 123, got {part2_result}"
+
+# Incremental sums must match a full recompute after rule changes
+book = UpdateBook(rules, updates)
+changes = [('remove', [(75, 47), (97, 75)]), ('add', [(13, 97), (29, 29)]),
+           ('remove', [(29, 29), (13, 97)]), ('add', [(75, 47), (97, 75)])]
+current_rules = set(rules)
+for action, changed in changes:
+    if action == 'add':
+        book.add_rules(changed)
+        current_rules |= set(changed)
+    else:
+        book.remove_rules(changed)
+        current_rules -= set(changed)
+    assert book.part1_sum == solve_puzzle_part1(list(current_rules), updates)
+    assert book.part2_sum == solve_puzzle_part2(list(current_rules), updates)
+
+book = UpdateBook([], [[11, 12, 13]])
+book.add_rules([(12, 12)])
+assert book.part1_sum == solve_puzzle_part1([(12, 12)], [[11, 12, 13]]) == 0
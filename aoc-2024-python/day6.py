@@ -1,4 +1,5 @@
 import sys
+from array import array
 from dataclasses import dataclass
 from typing import Set, Tuple
 
@@ -37,6 +38,41 @@ class Guard:
     def peek_forward(self) -> Position:
         return self.pos + self.DIRECTIONS[self.direction]
 
+class JumpTable:
+    """
+    For every cell and direction, how many steps the guard can walk straight ahead
+    and whether it then leaves the map or faces an obstacle.
+    Built once per map with one sweep per direction.
+    """
+    def __init__(self, grid: list[list[str]]):
+        self.rows = len(grid)
+        self.cols = len(grid[0])
+        size = self.rows * self.cols
+        self.steps = [array('i', [0]) * size for _ in Guard.DIRECTIONS]
+        self.exits = [bytearray(size) for _ in Guard.DIRECTIONS]
+        
+        for direction, delta in enumerate(Guard.DIRECTIONS):
+            steps, exits = self.steps[direction], self.exits[direction]
+            
+            # Sweep so the cell ahead is always filled in before the cell behind it
+            row_order = range(self.rows) if delta.row <= 0 else range(self.rows - 1, -1, -1)
+            col_order = range(self.cols) if delta.col <= 0 else range(self.cols - 1, -1, -1)
+            for row in row_order:
+                for col in col_order:
+                    next_row, next_col = row + delta.row, col + delta.col
+                    index = row * self.cols + col
+                    if not (0 <= next_row < self.rows and 0 <= next_col < self.cols):
+                        exits[index] = 1
+                    elif grid[next_row][next_col] != '#':
+                        ahead = next_row * self.cols + next_col
+                        steps[index] = steps[ahead] + 1
+                        exits[index] = exits[ahead]
+    
+    def jump(self, row: int, col: int, direction: int) -> Tuple[int, bool]:
+        """Returns (steps until the guard stops, True if it walks off the map)"""
+        index = row * self.cols + col
+        return self.steps[direction][index], bool(self.exits[direction][index])
+
 def read_input(filename: str) -> str:
     with open(filename) as f:
         return f.read().strip()
@@ -80,6 +116,31 @@ def simulate_path(grid: list[list[str]], guard: Guard) -> int:
     
     return len(visited)
 
+def simulate_path_jumps(grid: list[list[str]], guard: Guard) -> int:
+    """Same as simulate_path, but jumps from turn to turn and marks each walked span at once"""
+    table = JumpTable(grid)
+    cols = table.cols
+    visited = bytearray(table.rows * cols)
+    row, col, direction = guard.pos.row, guard.pos.col, guard.direction
+    visited[row * cols + col] = 1
+    
+    while True:
+        steps, exits = table.jump(row, col, direction)
+        delta = Guard.DIRECTIONS[direction]
+        end_row, end_col = row + delta.row * steps, col + delta.col * steps
+        
+        start, end = row * cols + col, end_row * cols + end_col
+        stride = abs(delta.row * cols + delta.col)
+        lo, hi = min(start, end), max(start, end)
+        visited[lo:hi + 1:stride] = b'\x01' * (steps + 1)
+        
+        if exits:
+            break
+        row, col = end_row, end_col
+        direction = (direction + 1) % 4
+    
+    return visited.count(1)
+
 def visualize_path(grid: list[list[str]], visited: Set[Tuple[int, int]]):
     for row in range(len(grid)):
         for col in range(len(grid[0])):
@@ -123,5 +184,9 @@ if __name__ == "__main__":
     example_result = solve_puzzle(example)
     print(f"Example result: {example_result}")
     assert example_result == 41, f"Expected 41, got {example_result}"
+
+    # The jump table pays off when reused, but must walk the same path
+    grid, guard = parse_map(example)
+    assert simulate_path_jumps(grid, guard) == example_result
     
     main()
@@ -1,4 +1,7 @@
+import os
 import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from typing import Set, Tuple, Optional, List
 
@@ -41,6 +44,41 @@ class Guard:
         """Returns a hashable state representation (position, direction)"""
         return (self.pos.as_tuple(), self.direction)
 
+class JumpTable:
+    """
+    For every cell and direction, how many steps the guard can walk straight ahead
+    and whether it then leaves the map or faces an obstacle.
+    Built once per map with one sweep per direction.
+    """
+    def __init__(self, grid: list[list[str]]):
+        self.rows = len(grid)
+        self.cols = len(grid[0])
+        size = self.rows * self.cols
+        self.steps = [array('i', [0]) * size for _ in Guard.DIRECTIONS]
+        self.exits = [bytearray(size) for _ in Guard.DIRECTIONS]
+        
+        for direction, delta in enumerate(Guard.DIRECTIONS):
+            steps, exits = self.steps[direction], self.exits[direction]
+            
+            # Sweep so the cell ahead is always filled in before the cell behind it
+            row_order = range(self.rows) if delta.row <= 0 else range(self.rows - 1, -1, -1)
+            col_order = range(self.cols) if delta.col <= 0 else range(self.cols - 1, -1, -1)
+            for row in row_order:
+                for col in col_order:
+                    next_row, next_col = row + delta.row, col + delta.col
+                    index = row * self.cols + col
+                    if not (0 <= next_row < self.rows and 0 <= next_col < self.cols):
+                        exits[index] = 1
+                    elif grid[next_row][next_col] != '#':
+                        ahead = next_row * self.cols + next_col
+                        steps[index] = steps[ahead] + 1
+                        exits[index] = exits[ahead]
+    
+    def jump(self, row: int, col: int, direction: int) -> Tuple[int, bool]:
+        """Returns (steps until the guard stops, True if it walks off the map)"""
+        index = row * self.cols + col
+        return self.steps[direction][index], bool(self.exits[direction][index])
+
 def read_input(filename: str) -> str:
     with open(filename) as f:
         return f.read().strip()
@@ -122,20 +160,259 @@ def find_loop_positions(grid: list[list[str]], start_guard: Guard) -> int:
     
     return loop_positions
 
-def solve_puzzle(input_text: str) -> int:
+def check_for_loop_jumps(table: JumpTable, row: int, col: int, direction: int,
+                         obstacle: Optional[Tuple[int, int]] = None) -> bool:
+    """
+    Same as check_for_loop, but jumps from turn to turn using the table.
+    An extra obstacle not in the table can be given as (row, col).
+    """
+    seen_turns = set()
+    
+    while True:
+        steps, exits = table.jump(row, col, direction)
+        
+        # Cut the jump short if the extra obstacle lies on it
+        if obstacle is not None:
+            if direction == 0 and obstacle[1] == col:
+                distance = row - obstacle[0]
+            elif direction == 1 and obstacle[0] == row:
+                distance = obstacle[1] - col
+            elif direction == 2 and obstacle[1] == col:
+                distance = obstacle[0] - row
+            elif direction == 3 and obstacle[0] == row:
+                distance = col - obstacle[1]
+            else:
+                distance = 0
+            if 1 <= distance <= steps:
+                steps, exits = distance - 1, False
+        
+        if exits:
+            return False
+        
+        delta = Guard.DIRECTIONS[direction]
+        row, col = row + delta.row * steps, col + delta.col * steps
+        direction = (direction + 1) % 4
+        
+        # Coming back to a turn we already made means the guard is looping
+        state = (row, col, direction)
+        if state in seen_turns:
+            return True
+        seen_turns.add(state)
+
+def find_loop_positions_jumps(grid: list[list[str]], start_guard: Guard) -> int:
+    """Same as find_loop_positions, with one jump table shared by every candidate"""
+    table = JumpTable(grid)
+    start = start_guard.pos.as_tuple()
+    loop_positions = 0
+    
+    for row in range(len(grid)):
+        for col in range(len(grid[0])):
+            if grid[row][col] != '.' or (row, col) == start:
+                continue
+            if check_for_loop_jumps(table, start[0], start[1], start_guard.direction, (row, col)):
+                loop_positions += 1
+    
+    return loop_positions
+
+class GuardStateAnalyzer:
+    """
+    Labels every (cell, direction) guard state as leaving the map or looping.
+    A state's successor is where the guard stands after walking to the next obstacle
+    and turning, so the states form a functional graph. Each walk stops at the first
+    state already labelled and gives the whole chain it walked that same label,
+    so every state is followed once and any start state is then a lookup.
+    """
+    UNKNOWN, ON_CHAIN, EXITS, LOOPS = 0, 1, 2, 3
+    
+    def __init__(self, grid: list[list[str]]):
+        table = JumpTable(grid)
+        self.cols = table.cols
+        strides = [delta.row * table.cols + delta.col for delta in Guard.DIRECTIONS]
+        labels = bytearray(table.rows * table.cols * 4)
+        
+        for first in range(len(labels)):
+            if labels[first]:
+                continue
+            chain = []
+            state = first
+            while labels[state] == self.UNKNOWN:
+                labels[state] = self.ON_CHAIN
+                chain.append(state)
+                index, direction = state >> 2, state & 3
+                if table.exits[direction][index]:
+                    result = self.EXITS
+                    break
+                index += strides[direction] * table.steps[direction][index]
+                state = (index << 2) | ((direction + 1) & 3)
+            else:
+                # Running into our own chain closes a new cycle
+                result = self.LOOPS if labels[state] == self.ON_CHAIN else labels[state]
+            for state in chain:
+                labels[state] = result
+        
+        self.labels = labels
+    
+    def loops(self, row: int, col: int, direction: int) -> bool:
+        """True if a guard starting here facing direction never leaves the map"""
+        return self.labels[((row * self.cols + col) << 2) | direction] == self.LOOPS
+
+class CompactMap:
+    """
+    Flat bytearray version of the map for tight loop checks.
+    The map is padded with a border of exit cells so moves need no bounds checks,
+    cells are flat indices and turn states are (index << 2) | direction.
+    Turns are marked as one bit per direction in a byte per cell, and a check
+    clears only the cells it marked, so the map costs two bytes per cell.
+    """
+    EMPTY, OBSTACLE, EXIT = 0, 1, 2
+    # Byte translation from map characters to cell codes
+    CELL_CODES = bytes([EMPTY] * ord('#') + [OBSTACLE] + [EMPTY] * (255 - ord('#')))
+    
+    def __init__(self, grid: list[list[str]]):
+        self.width = len(grid[0]) + 2
+        self.cells = bytearray([self.EXIT]) * (self.width * (len(grid) + 2))
+        for row, line in enumerate(grid):
+            start = self.index(row, 0)
+            self.cells[start:start + len(line)] = ''.join(line).encode().translate(self.CELL_CODES)
+        
+        # Same order as Guard.DIRECTIONS: up, right, down, left
+        self.offsets = (-self.width, 1, self.width, -1)
+        self.turns = bytearray(len(self.cells))
+    
+    def index(self, row: int, col: int) -> int:
+        return (row + 1) * self.width + col + 1
+    
+    def is_loop(self, start: int, direction: int, obstacle: int = -1) -> bool:
+        """Check if the guard loops, optionally with an extra obstacle at a flat index"""
+        cells, offsets, turns = self.cells, self.offsets, self.turns
+        marked = []
+        position = start
+        looped = False
+        
+        while True:
+            ahead = position + offsets[direction]
+            cell = cells[ahead]
+            if cell == self.EXIT:
+                break
+            if cell == self.OBSTACLE or ahead == obstacle:
+                # Only turns need marking, a loop always repeats one
+                bit = 1 << direction
+                if turns[position] & bit:
+                    looped = True
+                    break
+                if not turns[position]:
+                    marked.append(position)
+                turns[position] |= bit
+                direction = (direction + 1) & 3
+            else:
+                position = ahead
+        
+        for position in marked:
+            turns[position] = 0
+        return looped
+
+def obstruction_candidates(grid: list[list[str]],
+                           start_guard: Guard) -> Tuple[List[Tuple[int, int, int, Tuple[int, int]]], int]:
+    """
+    Only cells on the guard's original route can change it, so walk that route once
+    and return each cell the first time it is entered, together with the guard's
+    state just before it: (row, col, direction, obstacle).
+    Also returns how many off-route cells are loop positions for free: none if the
+    route leaves the map, every empty off-route cell if the route already loops.
+    """
+    rows, cols = len(grid), len(grid[0])
+    row, col, direction = start_guard.pos.row, start_guard.pos.col, start_guard.direction
+    visited = {(row, col)}  # The start position can't hold an obstacle
+    seen_states = {(row, col, direction)}
+    candidates = []
+    
+    while True:
+        delta = Guard.DIRECTIONS[direction]
+        next_row, next_col = row + delta.row, col + delta.col
+        if not (0 <= next_row < rows and 0 <= next_col < cols):
+            return candidates, 0
+        
+        if grid[next_row][next_col] == '#':
+            direction = (direction + 1) % 4
+        else:
+            if (next_row, next_col) not in visited:
+                visited.add((next_row, next_col))
+                candidates.append((row, col, direction, (next_row, next_col)))
+            row, col = next_row, next_col
+        
+        # The unobstructed route loops, so an obstacle off it changes nothing
+        state = (row, col, direction)
+        if state in seen_states:
+            off_route = sum(1 for r in range(rows) for c in range(cols)
+                            if grid[r][c] == '.' and (r, c) not in visited)
+            return candidates, off_route
+        seen_states.add(state)
+
+def find_loop_positions_on_path(grid: list[list[str]], start_guard: Guard) -> int:
+    """Try only the cells on the guard's route, resuming each check just before the cell"""
+    table = JumpTable(grid)
+    candidates, off_route_loops = obstruction_candidates(grid, start_guard)
+    return off_route_loops + sum(1 for row, col, direction, obstacle in candidates
+                                 if check_for_loop_jumps(table, row, col, direction, obstacle))
+
+def find_loop_positions_compact(grid: list[list[str]], start_guard: Guard) -> int:
+    """Same as find_loop_positions_on_path, stepping through a CompactMap instead of jumping"""
+    compact = CompactMap(grid)
+    candidates, off_route_loops = obstruction_candidates(grid, start_guard)
+    return off_route_loops + sum(1 for row, col, direction, obstacle in candidates
+                                 if compact.is_loop(compact.index(row, col), direction, compact.index(*obstacle)))
+
+# Jump table of the shared map, built once in each worker process
+_worker_table: Optional[JumpTable] = None
+
+def _init_worker(grid: list[list[str]]):
+    global _worker_table
+    _worker_table = JumpTable(grid)
+
+def _count_loops(candidates: List[Tuple[int, int, int, Tuple[int, int]]]) -> int:
+    return sum(1 for row, col, direction, obstacle in candidates
+               if check_for_loop_jumps(_worker_table, row, col, direction, obstacle))
+
+def find_loop_positions_parallel(grid: list[list[str]], start_guard: Guard,
+                                 workers: Optional[int] = None) -> int:
+    """
+    Same as find_loop_positions_on_path, with the candidates split across a process pool.
+    Workers get the map once and place the obstacle virtually, so nothing is mutated.
+    """
+    candidates, off_route_loops = obstruction_candidates(grid, start_guard)
+    workers = workers or os.cpu_count() or 1
+    chunk_size = max(1, -(-len(candidates) // (workers * 4)))
+    chunks = [candidates[i:i + chunk_size] for i in range(0, len(candidates), chunk_size)]
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(grid,)) as executor:
+        return off_route_loops + sum(executor.map(_count_loops, chunks))
+
+def solve_puzzle(input_text: str, parallel: bool = False, compact: bool = False) -> int:
     # Parse input
     grid, guard = parse_map(input_text)
     
     # Find positions that create loops
-    return find_loop_positions(grid, guard)
+    if parallel:
+        return find_loop_positions_parallel(grid, guard)
+    if compact:
+        return find_loop_positions_compact(grid, guard)
+    return find_loop_positions_on_path(grid, guard)
 
 def main():
-    if len(sys.argv) != 2:
+    args = sys.argv[1:]
+    parallel = '--parallel' in args
+    if parallel:
+        args.remove('--parallel')
+    compact = '--compact' in args
+    if compact:
+        args.remove('--compact')
+    if len(args) != 1:
         print("Please provide input file path")
         sys.exit(1)
         
-    input_text = read_input(sys.argv[1])
-    result = solve_puzzle(input_text)
+    input_text = read_input(args[0])
+    result = solve_puzzle(input_text, parallel, compact)
     print(f"Number of positions that create a loop: {result}")
 
 if __name__ == "__main__":
@@ -155,4 +432,31 @@ if __name__ == "__main__":
     print(f"Example result: {example_result}")
     assert example_result == 6, f"Expected 6, got {example_result}"
     
+    # Compact engine must agree with the original brute force
+    grid, guard = parse_map(example)
+    assert find_loop_positions_compact(grid, guard) == find_loop_positions(grid, guard)
+    
+    # A guard boxed in from the start loops already, so every empty cell counts
+    boxed = """.#.
+#^#
+.#."""
+    grid, guard = parse_map(boxed)
+    boxed_result = find_loop_positions(grid, guard)
+    assert boxed_result == 4, f"Expected 4, got {boxed_result}"
+    assert solve_puzzle(boxed) == boxed_result
+    assert solve_puzzle(boxed, compact=True) == boxed_result
+
+    # State labels must match a direct simulation from every start state
+    for text in (example, boxed):
+        grid, _ = parse_map(text)
+        analyzer = GuardStateAnalyzer(grid)
+        for row, line in enumerate(grid):
+            for col, cell in enumerate(line):
+                if cell == '#':
+                    continue
+                for direction in range(4):
+                    start = Guard(Position(row, col), '^')
+                    start.direction = direction
+                    assert analyzer.loops(row, col, direction) == check_for_loop(grid, start)
+
     main()